@@ -112,18 +112,10 @@ class Channels:
         assert isinstance(n_bins, int) and n_bins > 0, 'Number of ASE bins must be a positive integer.'
         ase_wl_bandwidth = (wl_end - wl_start) / n_bins
         ase_wls = np.linspace(wl_start, wl_end, n_bins)
-        for wl in ase_wls:
-            forward_channel = OpticalChannel.create_signal_channel(self.fiber, wl, ase_wl_bandwidth,
-                                                                   SIMULATION_MIN_POWER, None, direction=1, label="",
-                                                                   reflection_target_label='', reflectance=0,
-                                                                   channel_type='forward_ase')
-            self.forward_ase.append(forward_channel)
-
-            backward_channel = OpticalChannel.create_signal_channel(self.fiber, wl, ase_wl_bandwidth,
-                                                                    SIMULATION_MIN_POWER, None, direction=-1, label="",
-                                                                    reflection_target_label='', reflectance=0,
-                                                                    channel_type='backward_ase')
-            self.backward_ase.append(backward_channel)
+        forward_channels, backward_channels = OpticalChannel.create_ase_channels(self.fiber, ase_wls,
+                                                                                  ase_wl_bandwidth)
+        self.forward_ase.extend(forward_channels)
+        self.backward_ase.extend(backward_channels)
 
     def _init_raman(self, input_power, backward_raman_allowed):
         assert len(self.forward_signals) == 1 and len(self.backward_signals) == 0, 'Raman modeling is supported only ' \
@@ -0,0 +1,42 @@
+"""
+Ahead-of-time compilation of the numba backend's time stepping kernel.
+
+The numba backend compiles its kernel when dynamic_solver_numba is imported, or loads it from numba's cache. Compiling it
+ahead of time into a binary extension module removes the compilation and cache loading delay. However, numba.pycc
+supports neither parallel nor fastmath compilation, so the ahead-of-time compiled kernel runs serially and may be slower
+than the jit compiled kernel on multi-core machines. It is therefore only used when the environment variable
+PYFIBERAMP_NUMBA_AOT is set to 1. To build the module, execute this from the command line:
+    $ python -m pyfiberamp.dynamic.compile_numba_bindings
+or install the package with numba available and PYFIBERAMP_NUMBA_AOT=1, in which case setup.py builds it. The module
+records the version of numba_kernels.py it was built from, and the numba backend ignores it with a warning after the
+kernel has been modified until it is rebuilt.
+
+"""
+import importlib.util
+import os
+
+from numba.pycc import CC
+
+# The kernels are loaded from their file instead of through the package so that setup.py can build the module without
+# importing the package and its dependencies.
+_kernels_spec = importlib.util.spec_from_file_location(
+    'pyfiberamp.dynamic.numba_kernels', os.path.join(os.path.dirname(os.path.abspath(__file__)), 'numba_kernels.py'))
+numba_kernels = importlib.util.module_from_spec(_kernels_spec)
+_kernels_spec.loader.exec_module(numba_kernels)
+
+KERNEL_SOURCE_HASH = numba_kernels.KERNEL_SOURCE_HASH
+
+cc = CC('fiber_simulation_numba_bindings')
+cc.output_dir = os.path.dirname(os.path.abspath(__file__))
+
+cc.export('bfecc_steps', numba_kernels.BFECC_STEPS_SIGNATURE.format('f8'))(numba_kernels.bfecc_steps)
+cc.export('bfecc_steps_float32', numba_kernels.BFECC_STEPS_SIGNATURE.format('f4'))(numba_kernels.bfecc_steps)
+
+
+@cc.export('kernel_source_hash', 'i8()')
+def kernel_source_hash():
+    return KERNEL_SOURCE_HASH
+
+
+if __name__ == '__main__':
+    cc.compile()
@@ -34,6 +34,11 @@ class ConvergenceChecker:
 
         return not self.excitation_change_under_tolerance()
 
+    def next_checking_iteration(self, n_iteration):
+        """Returns the first iteration after n_iteration at which has_not_converged may return False."""
+        next_check = (n_iteration // self.convergence_checking_interval + 1) * self.convergence_checking_interval
+        return min(next_check, self.max_iterations)
+
     def update_mean_N2(self, N2):
         self.prev_mean_N2 = self.current_mean_N2
         self.current_mean_N2 = np.mean(N2[:, 1:-1] * self.weigths)  # Boundary points with N2=0 excluded
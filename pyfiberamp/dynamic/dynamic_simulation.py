@@ -2,7 +2,9 @@
 
 from pyfiberamp.channels import Channels
 from pyfiberamp.dynamic.dynamic_solver_python import DynamicSolverPython
+from pyfiberamp.dynamic.dynamic_solver_stiff import DynamicSolverStiff
 from pyfiberamp.helper_funcs import *
+from scipy.interpolate import interp1d
 import logging
 
 
@@ -18,6 +20,7 @@ class DynamicSimulation:
         self.fiber = None
         self.channels = Channels()
         self.max_time_steps = int(max_time_steps)
+        self.initial_state = None
         self.backends = self._get_available_backends()
         self._use_backend(self._fastest_backend())  # use fastest available backend by default
 
@@ -41,6 +44,7 @@ class DynamicSimulation:
         except ImportError:
             pass
         backends.append('python')
+        backends.append('stiff')
         return backends
 
     def _fastest_backend(self):
@@ -71,6 +75,16 @@ class DynamicSimulation:
         """
         self._use_backend('numba')
 
+    def use_stiff_backend(self):
+        """
+        Sets the simulation to use the quasi-static BDF solver. The solver adapts its time step to the rate of change
+        of the excitation and is therefore much faster for finding the steady state. The output powers are reported at
+        the solver's own time steps. Not suitable for inputs that change on the time scale of the fiber transit time.
+        The steady state is detected differently than with the other backends, see the steady_state_tolerance
+        parameter of :meth:`run`.
+        """
+        self._use_backend('stiff')
+
     def _use_backend(self, backend_name):
         if backend_name not in self.backends:
             default_backend = self._fastest_backend()
@@ -89,6 +103,8 @@ class DynamicSimulation:
                 self.backend = DynamicSolverNumba
             elif backend_name == 'python':
                 self.backend = DynamicSolverPython
+            elif backend_name == 'stiff':
+                self.backend = DynamicSolverStiff
 
     def get_time_coordinates(self, fiber, z_nodes, dt='auto'):
         """
@@ -229,8 +245,55 @@ class DynamicSimulation:
         """
         self.channels.add_ase(wl_start, wl_end, n_bins)
 
+    def set_initial_state(self, N2, forward_powers, backward_powers, z=None):
+        """
+        Sets the excitation and powers in the fiber at the start of the simulation, e.g. from a steady state result.
+        Starting close to the final state shortens steady state simulations. The initial state is used by every \
+        subsequent run unless the P or N2 argument of :meth:`run` is given, or until :meth:`clear_initial_state` is \
+        called. The fiber and all channels must be set before the initial state.
+
+        :param N2: Upper state ion density (1/m^3), one row per ion population.
+        :type N2: numpy float array
+        :param forward_powers: Powers of the forward channels in the same order as in the simulation result.
+        :type forward_powers: numpy float array
+        :param backward_powers: Powers of the backward channels in the same order as in the simulation result.
+        :type backward_powers: numpy float array
+        :param z: Positions of the array columns along the fiber. If None, the columns must match the z_nodes \
+        used in :meth:`run`. Otherwise, the arrays are interpolated to the simulation grid.
+        :type z: numpy float array or None
+
+        """
+        assert self.fiber is not None, 'The fiber must be set before the initial state.'
+        N2 = np.atleast_2d(N2)
+        forward_powers = np.atleast_2d(forward_powers)
+        backward_powers = np.atleast_2d(backward_powers)
+        self.channels.set_fiber(self.fiber)
+        forward_slice, backward_slice = self.channels.get_forward_and_backward_slices()
+        assert N2.shape[0] == self.fiber.num_ion_populations, 'N2 must have one row per ion population.'
+        assert forward_powers.shape[0] == forward_slice.stop - forward_slice.start, \
+            'forward_powers must have one row per forward channel.'
+        assert backward_powers.shape[0] == backward_slice.stop - backward_slice.start, \
+            'backward_powers must have one row per backward channel.'
+        assert N2.shape[1] == forward_powers.shape[1] == backward_powers.shape[1], \
+            'N2, forward_powers and backward_powers must have the same number of columns.'
+        assert z is None or len(z) == N2.shape[1], 'z must have one value per column of N2.'
+        self.initial_state = (N2, np.vstack((forward_powers, backward_powers)), z)
+
+    def clear_initial_state(self):
+        """Removes the initial state set with :meth:`set_initial_state`, so that the following runs start from an \
+        unexcited fiber."""
+        self.initial_state = None
+
+    def _initial_state_at_nodes(self, z_nodes):
+        N2, P, z = self.initial_state
+        if z is None:
+            return N2.copy(), P.copy()  # The solvers modify the arrays in-place.
+        z_nodes = np.linspace(0, self.fiber.length, z_nodes)
+        return (interp1d(z, N2, fill_value='extrapolate')(z_nodes),
+                interp1d(z, P, fill_value='extrapolate')(z_nodes))
+
     def run(self, z_nodes, dt='auto', P=None, N2=None, stop_at_steady_state=False,
-            steady_state_tolerance=1e-4, convergence_checking_interval=10000):
+            steady_state_tolerance=1e-4, convergence_checking_interval=10000, adaptive_dt=False, dtype=np.float64):
         """
         Runs the simulation.
 
@@ -240,25 +303,45 @@ class DynamicSimulation:
         based on the speed of light in glass and the spatial step size. Larger (and physically unrealistic) time steps \
         can be used to drastically speed up the convergence of steady state simulations.
         :type dt: float or str
-        :param P: Pre-existing powers in the fiber, useful when chaining multiple simulations.
+        :param P: Pre-existing powers in the fiber, useful when chaining multiple simulations. Overrides the powers \
+        set with :meth:`set_initial_state`.
         :type P: numpy float array
-        :param N2: Pre-existing upper state excitation in the fiber, useful when chaining multiple simulations.
+        :param N2: Pre-existing upper state excitation in the fiber, useful when chaining multiple simulations. \
+        Overrides the excitation set with :meth:`set_initial_state`.
         :type N2: numpy float array
         :param stop_at_steady_state: If this flag parameter is set to True, the simulation stops when the excitation \
         reaches a steady state (does not work if the excitation fluctuates at a specific frequency).
         :type stop_at_steady_state: bool
-        :param steady_state_tolerance: Sets the relative change in excitation that is used to detect the steady state.
+        :param steady_state_tolerance: Sets the relative change in excitation that is used to detect the steady state. \
+        The finite difference backends compare it with the relative change of the average excitation between two \
+        convergence checks. The stiff backend compares it with max|dN2/dt| * tau / mean(N2), the largest rate of \
+        change of the excitation relative to the mean excitation and the upper state lifetime tau, so the same value \
+        is not equally strict for both.
         :type steady_state_tolerance: float
         :param convergence_checking_interval: If aiming for steady state, the simulation checks convergence always after \
         this number of iterations and prints the average excitation. In truly dynamic simulations, only prints the \
         excitation.
         :type convergence_checking_interval: positive int
+        :param adaptive_dt: If True, the time step doubles whenever the excitation changes slowly, limited by the \
+        stability of the rate equation, and dt is only the initial step. Requires stop_at_steady_state and is only \
+        supported by the Python backend.
+        :type adaptive_dt: bool
+        :param dtype: Floating point type of the simulation. With numpy.float32, the simulation runs in single \
+        precision until the steady state is detected and then continues in double precision until the steady state is \
+        detected again, which takes at least one more convergence checking interval. Without stop_at_steady_state, \
+        the whole simulation runs in single precision. Only supported by the numba backend.
+        :type dtype: numpy.float64 or numpy.float32
 
         """
 
         self.channels.set_fiber(self.fiber)
+        if self.initial_state is not None:
+            initial_N2, initial_P = self._initial_state_at_nodes(z_nodes)
+            P = initial_P if P is None else P
+            N2 = initial_N2 if N2 is None else N2
         solver = self.backend(self.channels, self.fiber, z_nodes, self.max_time_steps, dt, P, N2,
-                              stop_at_steady_state, steady_state_tolerance, convergence_checking_interval)
+                              stop_at_steady_state, steady_state_tolerance, convergence_checking_interval,
+                              adaptive_dt, dtype)
         res = solver.run()
         return res
 
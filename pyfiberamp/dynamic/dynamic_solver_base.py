@@ -7,8 +7,12 @@ import numpy as np
 
 
 class DynamicSolverBase(ABC):
+    supports_adaptive_dt = False
+    supports_float32 = False
+
     def __init__(self, channels, fiber, n_nodes, max_iterations, dt, P, N2,
-                 stop_at_steady_state, steady_state_tolerance, convergence_checking_interval):
+                 stop_at_steady_state, steady_state_tolerance, convergence_checking_interval, adaptive_dt=False,
+                 dtype=np.float64):
         self.channels = channels
         self.fiber = fiber
         self.reflections = self.channels.get_reflections()
@@ -25,6 +29,8 @@ class DynamicSolverBase(ABC):
         self.stop_at_steady_state = stop_at_steady_state
         self.steady_state_tolerance = steady_state_tolerance
         self.convergence_checking_interval = convergence_checking_interval
+        self.adaptive_dt = self._check_adaptive_dt(adaptive_dt, stop_at_steady_state)
+        self.dtype = self._check_dtype(dtype)
 
     def _check_P(self, P, simulation_array_shape):
         if P is None:
@@ -49,6 +55,18 @@ class DynamicSolverBase(ABC):
             assert(dt < self.fiber.spectroscopy.upper_state_lifetime)
         return dt
 
+    def _check_adaptive_dt(self, adaptive_dt, stop_at_steady_state):
+        if adaptive_dt:
+            assert self.supports_adaptive_dt, 'Adaptive time step is not supported by this backend.'
+            assert stop_at_steady_state, 'Adaptive time step can only be used for finding the steady state.'
+        return adaptive_dt
+
+    def _check_dtype(self, dtype):
+        assert dtype in (np.float64, np.float32), 'Data type must be numpy.float64 or numpy.float32.'
+        if dtype == np.float32:
+            assert self.supports_float32, 'Single precision is not supported by this backend.'
+        return dtype
+
     def run(self):
         a = self.channels.get_absorption()
         g = self.channels.get_gain()
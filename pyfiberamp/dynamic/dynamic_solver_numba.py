@@ -1,27 +1,47 @@
+import logging
+import os
+
 import numpy as np
 from numba import njit
 from pyfiberamp.dynamic.dynamic_solver_python import DynamicSolverPython
-from pyfiberamp.parameters import SIMULATION_MIN_POWER
-from pyfiberamp.dynamic import inner_loop_functions
+from pyfiberamp.dynamic import numba_kernels
+from pyfiberamp.dynamic.numba_kernels import BFECC_STEPS_SIGNATURE
+
+
+def load_ahead_of_time_bindings():
+    """Returns the kernels compiled ahead of time with compile_numba_bindings.py, or None if the module has not been
+    built or was built from a different version of numba_kernels.py."""
+    try:
+        from pyfiberamp.dynamic import fiber_simulation_numba_bindings
+    except ImportError:
+        logging.warning('PYFIBERAMP_NUMBA_AOT is set but the ahead-of-time compiled numba kernel has not been built. '
+                        'Using the jit compiled kernel.')
+        return None
+    source_hash = getattr(fiber_simulation_numba_bindings, 'kernel_source_hash', None)
+    if source_hash is None or source_hash() != numba_kernels.KERNEL_SOURCE_HASH:
+        logging.warning('The ahead-of-time compiled numba kernel is out of date and is ignored. Rebuild it with '
+                        '"python -m pyfiberamp.dynamic.compile_numba_bindings". Using the jit compiled kernel.')
+        return None
+    return fiber_simulation_numba_bindings
+
 
+# The ahead-of-time compiled kernel runs serially and without fastmath, so it is only used on request.
+bindings = load_ahead_of_time_bindings() if os.environ.get('PYFIBERAMP_NUMBA_AOT') == '1' else None
 
-dPdZ = njit(inner_loop_functions.dPdZ)
-dNdT = njit(inner_loop_functions.dNdT)
-shift_against_propagation_direction_to_from = njit(inner_loop_functions.shift_against_propagation_direction_to_from)
-shift_to_propagation_direction_to_from = njit(inner_loop_functions.shift_to_propagation_direction_to_from)
-min_clamp = njit(inner_loop_functions.min_clamp)
-apply_input = njit(inner_loop_functions.apply_input)
-apply_output = njit(inner_loop_functions.apply_output)
-apply_reflection = njit(inner_loop_functions.apply_reflection)
-new_P = njit(inner_loop_functions.new_P)
+bfecc_steps = njit(cache=True, parallel=True, fastmath=True)(numba_kernels.bfecc_steps)
+if bindings is None:
+    # The double precision kernel is compiled, or loaded from the cache, when this module is imported instead of on the
+    # first run. The rarely used single precision kernel is compiled on its first run.
+    bfecc_steps.compile(BFECC_STEPS_SIGNATURE.format('f8'))
 
 
 class DynamicSolverNumba(DynamicSolverPython):
+    supports_adaptive_dt = False
+    supports_float32 = True
+
     def _bfecc_simulation(self, P_fiber_in, N2_in, dPdz, dN2dt,
                           boundary_conditions, convergence_checker, dz, dt, n_forward):
         P = np.zeros((P_fiber_in.shape[0], P_fiber_in.shape[1] + 1))
-        P_hat_forward = np.zeros_like(P)
-        P_hat_backward = np.zeros_like(P)
         P[:, :-1] = P_fiber_in
         P[:, -1] = P_fiber_in[:, -1]
 
@@ -30,38 +50,55 @@ class DynamicSolverNumba(DynamicSolverPython):
         N2[:, -1] = N2_in[:, -1]
 
         # Unpack class attributes.
-        source_idx = np.array([i[0] for i in boundary_conditions.reflections], dtype=np.int)
-        target_idx = np.array([i[1] for i in boundary_conditions.reflections], dtype=np.int)
-        R = np.array([i[2] for i in boundary_conditions.reflections], dtype=np.float)
-        P_in_out = boundary_conditions.P_in_out
+        source_idx = np.array([i[0] for i in boundary_conditions.reflections], dtype=np.int64)
+        target_idx = np.array([i[1] for i in boundary_conditions.reflections], dtype=np.int64)
+        R = np.array([i[2] for i in boundary_conditions.reflections], dtype=np.float64)
+        reflection_arrays = (source_idx, target_idx, R)
         num_ion_populations = dN2dt.num_ion_populations
         n_channels = dN2dt.n_channels
-        a_per_h_v_pi_r2 = dN2dt.a_per_h_v_pi_r2
-        a_g_per_h_v_pi_r2_Nt = dN2dt.a_g_per_h_v_pi_r2_Nt
-        A = dN2dt.A
-        a_g_per_Nt = dPdz.a_g_per_Nt
-        a_l = dPdz.a_l
-        g_m_h_v_dv_per_Nt = dPdz.g_m_h_v_dv_per_Nt
+        # The step sizes are constant, so they are multiplied into the channel parameters once.
+        coefficients = dN2dt.step_coefficients(dt) + dPdz.step_coefficients(dz)
 
         idx_iteration = 0
-        while convergence_checker.has_not_converged(N2, idx_iteration):
-            # The first array argument passed to each of these binding
-            # functions is modified in-place.
-            apply_input(P, P_in_out, idx_iteration, n_forward)
-            apply_reflection(P, source_idx, target_idx, R, n_forward)
-            dNdT(N2, P, a_per_h_v_pi_r2, a_g_per_h_v_pi_r2_Nt, A, dt, num_ion_populations, n_channels)
-            min_clamp(N2, SIMULATION_MIN_POWER)
-            shift_to_propagation_direction_to_from(P_hat_forward, P, n_forward)
-            apply_output(P_in_out, P_hat_forward, idx_iteration, n_forward)
-            dPdZ(P_hat_forward, N2, a_g_per_Nt, a_l, g_m_h_v_dv_per_Nt, dz, num_ion_populations, n_channels, True)
-            min_clamp(P_hat_forward, SIMULATION_MIN_POWER)
-            shift_against_propagation_direction_to_from(P_hat_backward, P_hat_forward, n_forward)
-            dPdZ(P_hat_backward, N2, a_g_per_Nt, a_l, g_m_h_v_dv_per_Nt, dz, num_ion_populations, n_channels, False)
-            new_P(P, P_hat_forward, P_hat_backward)
-            min_clamp(P, SIMULATION_MIN_POWER)
-            idx_iteration += 1
+        if self.dtype == np.float32:
+            # The transient runs in single precision until the excitation settles. The arrays are then upcast and the
+            # steady state is refined in double precision for at least one more checking interval.
+            P_32, N2_32 = P.astype(np.float32), N2.astype(np.float32)
+            idx_iteration = self._bfecc_steps_until_converged(
+                P_32, N2_32, boundary_conditions, convergence_checker, [np.float32(c) for c in coefficients],
+                reflection_arrays, n_forward, num_ion_populations, n_channels, idx_iteration)
+            P[...] = P_32
+            N2[...] = N2_32
+        if idx_iteration < convergence_checker.max_iterations:
+            idx_iteration = self._bfecc_steps_until_converged(
+                P, N2, boundary_conditions, convergence_checker, coefficients,
+                reflection_arrays, n_forward, num_ion_populations, n_channels, idx_iteration)
 
         boundary_conditions.apply_input(P, idx_iteration)
         boundary_conditions.apply_reflection(P)
         boundary_conditions.correct_output_by_reflection()
         return P, N2, idx_iteration
+
+    @staticmethod
+    def _bfecc_steps_until_converged(P, N2, boundary_conditions, convergence_checker, coefficients,
+                                     reflection_arrays, n_forward, num_ion_populations, n_channels, idx_iteration):
+        """Runs the compiled loop uninterrupted from one convergence check to the next until the simulation has
+        converged or reached the maximum number of iterations. Returns the number of the last iteration."""
+        # Scratch space for the BFECC estimates of one channel at a time.
+        P_hat = np.zeros(P.shape[1], dtype=P.dtype), np.zeros(P.shape[1], dtype=P.dtype)
+        steps = DynamicSolverNumba._bfecc_steps_function(P.dtype)
+        while True:
+            next_check = convergence_checker.next_checking_iteration(idx_iteration)
+            steps(P, *P_hat, N2, boundary_conditions.P_in_out, *reflection_arrays, *coefficients,
+                  n_forward, num_ion_populations, n_channels, idx_iteration, next_check)
+            idx_iteration = next_check
+            if not convergence_checker.has_not_converged(N2, idx_iteration):
+                return idx_iteration
+
+    @staticmethod
+    def _bfecc_steps_function(dtype):
+        """Returns the ahead-of-time compiled kernel for the data type if it was requested with the environment
+        variable PYFIBERAMP_NUMBA_AOT=1 and is up to date, and the jit compiled kernel otherwise."""
+        if bindings is None:
+            return bfecc_steps
+        return bindings.bfecc_steps_float32 if dtype == np.float32 else bindings.bfecc_steps
@@ -7,6 +7,10 @@ from pyfiberamp.helper_funcs import *
 
 
 class DynamicSolverPython(DynamicSolverBase):
+    supports_adaptive_dt = True
+    ADAPTIVE_DT_GROWTH_THRESHOLD = 1e-4  # Max. relative change of excitation per step that allows doubling dt
+    MAX_RELAXATION_RATE_DT = 0.5  # Keeps the explicit excitation update stable and non-oscillating
+
     def __init__(self, *args, **kwargs):
         super().__init__(*args, **kwargs)
 
@@ -19,7 +23,7 @@ class DynamicSolverPython(DynamicSolverBase):
         max_iterations = P_in_out.shape[1] - 1
         dz = fiber_length / (nodes - 1)
         n_ion_populations = int(len(ion_cross_section_areas) / n_channels)
-        channel_params = ChannelParameters(a, g, l, v, dv, nodes, ion_cross_section_areas, ion_number_densities, n_channels)
+        channel_params = ChannelParameters(a, g, l, v, dv, ion_cross_section_areas, ion_number_densities, n_channels)
         boundary_conditions = DynamicBoundaryConditions(P_in_out, reflections, n_forward)
         dn2dt = dNdT(channel_params, upper_state_lifetime)
         dpdz = dPdZ(channel_params)
@@ -45,12 +49,18 @@ class DynamicSolverPython(DynamicSolverBase):
         N2[:, -1] = N2_in[:, -1]
 
         idx_iteration = 0
+        t = 0
         while convergence_checker.has_not_converged(N2, idx_iteration):
             boundary_conditions.apply_input(P, idx_iteration)
             boundary_conditions.apply_reflection(P)
 
-            N2 += dt * dN2dt(P, N2)
+            dN2 = dt * dN2dt(P, N2)
+            N2 += dN2
             min_clamp(N2, SIMULATION_MIN_POWER)
+            if self.adaptive_dt:
+                self.t[idx_iteration] = t
+                t += dt
+                dt = self._adapt_dt(dt, dN2, N2, P, dN2dt)
 
             shift_to_propagation_direction_to_from(P_hat_forward, P, n_forward)
             boundary_conditions.apply_output(P_hat_forward, idx_iteration)
@@ -68,3 +78,10 @@ class DynamicSolverPython(DynamicSolverBase):
         boundary_conditions.apply_reflection(P)
         boundary_conditions.correct_output_by_reflection()
         return P, N2, idx_iteration
+
+    def _adapt_dt(self, dt, dN2, N2, P, dN2dt):
+        """Doubles the time step when the excitation changes slowly and limits it by the relaxation rate of the rate
+        equation."""
+        if np.max(np.abs(dN2)) < self.ADAPTIVE_DT_GROWTH_THRESHOLD * np.max(N2):
+            dt *= 2
+        return min(dt, self.MAX_RELAXATION_RATE_DT / np.max(dN2dt.relaxation_rate(P)))
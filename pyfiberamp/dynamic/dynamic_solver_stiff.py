@@ -0,0 +1,234 @@
+import logging
+import math
+
+import numpy as np
+from scipy.integrate import solve_ivp
+from scipy.sparse import diags
+
+from pyfiberamp.dynamic.dynamic_solver_base import DynamicSolverBase
+from pyfiberamp.dynamic.dynamic_boundary_conditions import DynamicBoundaryConditions
+from pyfiberamp.helper_funcs import *
+
+
+def propagate_loops(N2, P_in, a_g_per_Nt_dz, a_l_dz, g_m_h_v_dv_per_Nt_dz, n_forward, source_idx, target_idx, R,
+                    max_reflection_iterations, reflection_tolerance):
+    """Loop version of DynamicSolverStiff._propagate for compiling with numba. The channel parameters are premultiplied
+    by the step length dz and are (ion population, channel) arrays, except for the (channel,) array `a_l_dz`."""
+    num_ion_populations, nodes = N2.shape
+    n_channels = P_in.shape[0]
+    G = np.empty((n_channels, nodes - 1))
+    S = np.empty((n_channels, nodes - 1))
+    for j in range(n_channels):
+        for k in range(nodes - 1):
+            gain = -a_l_dz[j]
+            source = 0.0
+            for i in range(num_ion_populations):
+                N2_step = 0.5 * (N2[i, k] + N2[i, k + 1])
+                gain += a_g_per_Nt_dz[i, j] * N2_step
+                source += g_m_h_v_dv_per_Nt_dz[i, j] * N2_step
+            G[j, k] = math.exp(gain)
+            S[j, k] = source * (math.expm1(gain) / gain if abs(gain) >= 1e-12 else 1.0)
+
+    P = np.empty((n_channels, nodes))
+    inputs = P_in.copy()
+    for _ in range(max_reflection_iterations):
+        for j in range(n_forward):
+            P[j, 0] = inputs[j]
+            for k in range(nodes - 1):
+                P[j, k + 1] = G[j, k] * P[j, k] + S[j, k]
+        for j in range(n_forward, n_channels):
+            P[j, nodes - 1] = inputs[j]
+            for k in range(nodes - 2, -1, -1):
+                P[j, k] = G[j, k] * P[j, k + 1] + S[j, k]
+        reflected_inputs = P_in.copy()
+        for m in range(len(source_idx)):
+            if source_idx[m] < n_forward:
+                reflected_inputs[target_idx[m]] += R[m] * P[source_idx[m], nodes - 1]
+            else:
+                reflected_inputs[target_idx[m]] += R[m] * P[source_idx[m], 0]
+        converged = True
+        for j in range(n_channels):
+            if abs(reflected_inputs[j] - inputs[j]) > reflection_tolerance * abs(inputs[j]):
+                converged = False
+        if converged:
+            break
+        inputs = reflected_inputs
+    return P
+
+
+try:
+    from numba import njit
+    propagate_compiled = njit(propagate_loops, cache=True, fastmath=True)
+except ImportError:
+    propagate_compiled = None
+
+
+class DynamicSolverStiff(DynamicSolverBase):
+    """
+    Quasi-static solver that integrates the rate equations with an adaptive BDF method. The powers are assumed to
+    settle instantaneously along the fiber, which is accurate when the inputs vary slowly compared to the transit time
+    of light through the fiber. The time step grows by orders of magnitude as the excitation approaches the steady
+    state, which makes this solver well suited for steady state simulations. The output powers are reported at the
+    time steps taken by the solver.
+    """
+    supports_adaptive_dt = True  # The time step is always adaptive.
+    RTOL = 1e-6
+    MAX_REFLECTION_ITERATIONS = 100
+    REFLECTION_TOLERANCE = 1e-12
+
+    def solve(self, P, N2, g, a, l, v, dv, P_in_out, reflections,
+              ion_cross_section_areas, upper_state_lifetime,
+              fiber_length, ion_number_densities, n_forward,
+              steady_state_tolerance, dt, stop_at_steady_state, n_channels,
+              convergence_checking_interval):
+        nodes = P.shape[1]
+        n_ion_populations = N2.shape[0]
+        max_iterations = P_in_out.shape[1] - 1
+        self.boundary_conditions = DynamicBoundaryConditions(P_in_out, reflections, n_forward)
+        self.reflection_arrays = (np.array([r[0] for r in reflections], dtype=np.int64),
+                                  np.array([r[1] for r in reflections], dtype=np.int64),
+                                  np.array([r[2] for r in reflections], dtype=np.float64))
+        self.dz = fiber_length / (nodes - 1)
+        self.n_forward = n_forward
+        self.A = 1 / upper_state_lifetime
+        self._init_channel_parameters(g, a, l, v, dv, ion_cross_section_areas, ion_number_densities,
+                                      n_channels, n_ion_populations)
+        P_in = P_in_out.copy()
+        N2_shape = N2.shape
+
+        def input_powers(t):
+            return P_in[:, min(int(t / dt), max_iterations - 1)]
+
+        def rhs(t, y):
+            N2_t = y.reshape(N2_shape)
+            return self._dN2dt(self._propagate(N2_t, input_powers(t)), N2_t).ravel()
+
+        def jac(t, y):
+            N2_t = y.reshape(N2_shape)
+            return diags(self._dN2dt_jacobian_diagonal(self._propagate(N2_t, input_powers(t))).ravel())
+
+        def steady_state_event(t, y):
+            N2_t = y.reshape(N2_shape)
+            relative_rate = np.max(np.abs(rhs(t, y))) * upper_state_lifetime / (np.mean(N2_t) + SIMULATION_MIN_POWER)
+            return relative_rate - steady_state_tolerance
+        steady_state_event.terminal = True
+        steady_state_event.direction = -1
+
+        y0 = N2.ravel()
+        if stop_at_steady_state and steady_state_event(0, y0) < 0:
+            # The event only triggers when the rate falls below the tolerance, so an initial state that is already
+            # steady would otherwise be integrated over the whole time span.
+            t_out, y_out = np.zeros(1), y0[:, np.newaxis]
+        else:
+            atol = self.RTOL * np.repeat(np.asarray(ion_number_densities[:n_ion_populations]), nodes)
+            sol = solve_ivp(rhs, (0, max_iterations * dt), y0, method='BDF', jac=jac,
+                            rtol=self.RTOL, atol=atol,
+                            events=steady_state_event if stop_at_steady_state else None)
+            if not sol.success:
+                logging.warning('The stiff solver stopped at t = {:.3E} s before the end of the simulation: {}'
+                                .format(sol.t[-1], sol.message))
+            t_out, y_out = sol.t, sol.y
+
+        # Outputs are stored at the solver's own time steps instead of the fixed time grid.
+        n_iter = len(t_out)
+        self.t = t_out
+        self.P_in_out = np.zeros((P_in_out.shape[0], n_iter))
+        for idx, (t, y) in enumerate(zip(t_out, y_out.T)):
+            P_t = self._propagate(y.reshape(N2_shape), input_powers(t))
+            self.P_in_out[:n_forward, idx] = P_t[:n_forward, -1]
+            self.P_in_out[n_forward:, idx] = P_t[n_forward:, 0]
+        self.boundary_conditions.P_in_out = self.P_in_out
+        self.boundary_conditions.correct_output_by_reflection()
+
+        N2[...] = y_out[:, -1].reshape(N2_shape)
+        P[...] = self._propagate(N2, input_powers(t_out[-1]))
+        return n_iter
+
+    def _init_channel_parameters(self, g, a, l, v, dv, ion_cross_section_areas, ion_number_densities,
+                                 n_channels, n_ion_populations):
+        """Reshapes the channel parameters to (ion population, channel) arrays."""
+        def by_population(arr):
+            return np.asarray(arr).reshape(n_channels, n_ion_populations).T
+
+        a, g, l, v, dv = (by_population(arr) for arr in (a, g, l, v, dv))
+        areas = by_population(ion_cross_section_areas)
+        Nt = by_population(ion_number_densities)
+        h_v_pi_r2 = h * v * areas
+        self.a_per_h_v_pi_r2 = a / h_v_pi_r2
+        self.a_g_per_h_v_pi_r2_Nt = (a + g) / Nt / h_v_pi_r2
+        # The propagation parameters are only needed per z step.
+        self.a_g_per_Nt_dz = (a + g) / Nt * self.dz
+        self.a_l_dz = np.sum(a + l, axis=0) * self.dz
+        self.g_m_h_v_dv_per_Nt_dz = NUMBER_OF_MODES_IN_SINGLE_MODE_FIBER * h * g * v * dv / Nt * self.dz
+
+    def _dN2dt(self, P, N2):
+        return self.a_per_h_v_pi_r2 @ P - N2 * (self.a_g_per_h_v_pi_r2_Nt @ P) - self.A * N2
+
+    def _dN2dt_jacobian_diagonal(self, P):
+        """Derivative of dN2/dt with respect to the local excitation when the powers are held fixed."""
+        return -self.a_g_per_h_v_pi_r2_Nt @ P - self.A
+
+    def _propagate(self, N2, P_in):
+        """Returns the steady powers along the fiber for the excitation N2 and input powers P_in. The gain and
+        spontaneous emission are integrated exactly over each z step using the mean excitation of the step. Uses the
+        numba compiled loops if numba is available."""
+        if propagate_compiled is not None:
+            return propagate_compiled(N2, P_in, self.a_g_per_Nt_dz, self.a_l_dz, self.g_m_h_v_dv_per_Nt_dz,
+                                      self.n_forward, *self.reflection_arrays,
+                                      self.MAX_REFLECTION_ITERATIONS, self.REFLECTION_TOLERANCE)
+        N2_step = 0.5 * (N2[:, :-1] + N2[:, 1:])
+        gain = self.a_g_per_Nt_dz.T @ N2_step - self.a_l_dz[:, np.newaxis]
+        G = np.exp(gain)
+        S = (self.g_m_h_v_dv_per_Nt_dz.T @ N2_step) * self._expm1_ratio(gain)
+
+        inputs = P_in.copy()
+        for _ in range(self.MAX_REFLECTION_ITERATIONS):
+            P = self._march(G, S, inputs)
+            reflected_inputs = P_in.copy()
+            self._apply_reflection(reflected_inputs, P)
+            if np.allclose(reflected_inputs, inputs, rtol=self.REFLECTION_TOLERANCE, atol=0):
+                break
+            inputs = reflected_inputs
+        return P
+
+    def _march(self, G, S, inputs):
+        """Solves P[k + 1] = G[k] * P[k] + S[k] for the forward channels and P[k] = G[k] * P[k + 1] + S[k] for the
+        backward channels."""
+        P = np.empty((len(inputs), G.shape[1] + 1))
+        f = slice(None, self.n_forward)
+        b = slice(self.n_forward, None)
+        P[f, :] = self._linear_recurrence(G[f, :], S[f, :], inputs[f])
+        P[b, :] = self._linear_recurrence(G[b, ::-1], S[b, ::-1], inputs[b])[:, ::-1]
+        return P
+
+    @staticmethod
+    def _linear_recurrence(G, S, x0):
+        """Returns x with x[:, 0] = x0 and x[:, k + 1] = G[:, k] * x[:, k] + S[:, k]. The closed form
+        x[:, k + 1] = C[:, k] * (x0 + sum(S[:, :k + 1] / C[:, :k + 1])) with C = cumprod(G) replaces the loop over k
+        unless the cumulative gain gets too large or small to be represented accurately."""
+        x = np.empty((len(x0), G.shape[1] + 1))
+        x[:, 0] = x0
+        C = np.cumprod(G, axis=1)
+        if np.all((C > 1e-200) & (C < 1e200)):
+            x[:, 1:] = C * (x0[:, np.newaxis] + np.cumsum(S / C, axis=1))
+        else:
+            for k in range(G.shape[1]):
+                x[:, k + 1] = G[:, k] * x[:, k] + S[:, k]
+        return x
+
+    def _apply_reflection(self, inputs, P):
+        for source_idx, target_idx, R in self.boundary_conditions.reflections:
+            if source_idx < self.n_forward:
+                inputs[target_idx] += R * P[source_idx, -1]
+            else:
+                inputs[target_idx] += R * P[source_idx, 0]
+
+    @staticmethod
+    def _expm1_ratio(x):
+        """Returns (exp(x) - 1) / x, which tends to 1 as x approaches zero."""
+        small = np.abs(x) < 1e-12
+        return np.where(small, 1.0, np.expm1(x) / np.where(small, 1.0, x))
+
+    def extrapolate_first_point(self, N2):
+        # The quasi-static solution is valid at every node including the fiber start.
+        return N2
@@ -5,10 +5,15 @@ from pyfiberamp.helper_funcs import *
 def reorganize_by_ion_population(arr, num_ion_populations, n_channels):
     out = np.empty_like(arr)
     for i in range(num_ion_populations):
-        out[i * n_channels:(i + 1) * n_channels, :] = arr[i::num_ion_populations, :]
+        out[i * n_channels:(i + 1) * n_channels] = arr[i::num_ion_populations]
     return out
 
 
+def by_ion_population_columns(arr, num_ion_populations):
+    """Splits an array reorganized by ion population into one column vector per population."""
+    return [column[:, np.newaxis] for column in np.split(arr, num_ion_populations)]
+
+
 class dNdT:
     def __init__(self, channel_params, tau):
         self.A = 1 / tau
@@ -24,16 +29,30 @@ class dNdT:
                                                                  self.num_ion_populations, self.n_channels)
         self.a_per_h_v_pi_r2 = reorganize_by_ion_population(self.a_per_h_v_pi_r2,
                                                             self.num_ion_populations, self.n_channels)
+        # Column vectors for each ion population, sliced once instead of on every time step.
+        self._a_per_h_v_pi_r2_columns = by_ion_population_columns(self.a_per_h_v_pi_r2, self.num_ion_populations)
+        self._a_g_per_h_v_pi_r2_Nt_columns = by_ion_population_columns(self.a_g_per_h_v_pi_r2_Nt,
+                                                                       self.num_ion_populations)
 
     def __call__(self, P, N2):
-        out = np.empty_like(N2)
+        # Boundary points don't have ions
+        out = -self.A * N2
+        for i in range(self.num_ion_populations):
+            out[i, 1:-1] += np.sum(P[:, 1:-1] * (self._a_per_h_v_pi_r2_columns[i]
+                                                - self._a_g_per_h_v_pi_r2_Nt_columns[i] * N2[i, 1:-1]), axis=0)
+        return out
+
+    def relaxation_rate(self, P):
+        """Returns the rate at which the excitation relaxes towards its local equilibrium, -d(dN2/dt)/dN2."""
+        out = np.full((self.num_ion_populations, P.shape[1]), self.A)
         for i in range(self.num_ion_populations):
-            start = i * self.n_channels
-            end = start + self.n_channels
-            out[i, :] = np.sum(P * (self.a_per_h_v_pi_r2[start:end, :]
-                                    - self.a_g_per_h_v_pi_r2_Nt[start:end, :] * N2[i, :]), axis=0) - self.A * N2[i, :]
+            out[i, 1:-1] += np.sum(P[:, 1:-1] * self._a_g_per_h_v_pi_r2_Nt_columns[i], axis=0)
         return out
 
+    def step_coefficients(self, dt):
+        """Returns the channel parameters and the decay rate premultiplied by the time step `dt`."""
+        return self.a_per_h_v_pi_r2 * dt, self.a_g_per_h_v_pi_r2_Nt * dt, self.A * dt
+
 
 class dPdZ:
     def __init__(self, channel_params):
@@ -46,36 +65,40 @@ class dPdZ:
         self.a_g_per_Nt = reorganize_by_ion_population(self.a_g_per_Nt, self.num_ion_populations, self.n_channels)
         self.a_l = reorganize_by_ion_population(self.a_l, self.num_ion_populations, self.n_channels)
         self.g_m_h_v_dv_per_Nt = reorganize_by_ion_population(self.g_m_h_v_dv_per_Nt, self.num_ion_populations, self.n_channels)
+        # Column vectors for each ion population, sliced once instead of on every propagation step.
+        self._a_g_per_Nt_columns = by_ion_population_columns(self.a_g_per_Nt, self.num_ion_populations)
+        self._a_l_columns = by_ion_population_columns(self.a_l, self.num_ion_populations)
+        self._g_m_h_v_dv_per_Nt_columns = by_ion_population_columns(self.g_m_h_v_dv_per_Nt, self.num_ion_populations)
+        # The losses don't depend on the excitation, so they are summed over the ion populations once.
+        self._a_l_total_column = np.sum(self._a_l_columns, axis=0)
 
     def __call__(self, P, N2):
+        # Boundary points don't have ions
         out = np.zeros_like(P)
+        P_inner = P[:, 1:-1]
+        out_inner = out[:, 1:-1]
+        np.multiply(P_inner, -self._a_l_total_column, out=out_inner)
         for i in range(self.num_ion_populations):
-            start = i * self.n_channels
-            end = start + self.n_channels
-            out[...] += P * (self.a_g_per_Nt[start:end, :] * N2[i, :] - self.a_l[start:end, :]) + self.g_m_h_v_dv_per_Nt[start:end, :] * N2[i, :]
+            out_inner += (P_inner * self._a_g_per_Nt_columns[i] + self._g_m_h_v_dv_per_Nt_columns[i]) * N2[i, 1:-1]
         return out
 
+    def step_coefficients(self, dz):
+        """Returns the channel parameters premultiplied by the step length `dz`."""
+        return self.a_g_per_Nt * dz, self.a_l * dz, self.g_m_h_v_dv_per_Nt * dz
+
 
 class ChannelParameters:
-    def __init__(self, a, g, l, v, dv, nodes, ion_cross_section_areas, ion_number_densities, n_channels):
-        simulation_array_shape = (len(a), nodes + 1) # Extra boundary point
-        self.a = a[:, np.newaxis] * np.ones(simulation_array_shape)
-        self.g = g[:, np.newaxis] * np.ones(simulation_array_shape)
-        self.l = l[:, np.newaxis] * np.ones(simulation_array_shape)
-        self.v = v[:, np.newaxis] * np.ones(simulation_array_shape)
-        self.dv = dv[:, np.newaxis] * np.ones(simulation_array_shape)
-        self.ion_cross_section_areas = ion_cross_section_areas[:, np.newaxis] * np.ones(simulation_array_shape)
-        self.ion_number_densities = ion_number_densities[:, np.newaxis] * np.ones(simulation_array_shape)
+    """Channel parameters as contiguous arrays with one value per channel and ion population."""
+    def __init__(self, a, g, l, v, dv, ion_cross_section_areas, ion_number_densities, n_channels):
+        self.a = np.ascontiguousarray(a, dtype=np.float64)
+        self.g = np.ascontiguousarray(g, dtype=np.float64)
+        self.l = np.ascontiguousarray(l, dtype=np.float64)
+        self.v = np.ascontiguousarray(v, dtype=np.float64)
+        self.dv = np.ascontiguousarray(dv, dtype=np.float64)
+        self.ion_cross_section_areas = np.ascontiguousarray(ion_cross_section_areas, dtype=np.float64)
+        self.ion_number_densities = np.ascontiguousarray(ion_number_densities, dtype=np.float64)
         self.n_channels = n_channels
 
-        # Boundary points don't have ions
-        self.a[:, 0] = 0
-        self.a[:, -1] = 0
-        self.g[:, 0] = 0
-        self.g[:, -1] = 0
-        self.l[:, 0] = 0
-        self.l[:, -1] = 0
-
 
 def shift_against_propagation_direction_to_from(dest_arr, source_arr, n_forward):
     dest_arr[:n_forward, :-1] = source_arr[:n_forward, 1:]
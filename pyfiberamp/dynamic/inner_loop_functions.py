@@ -18,32 +18,34 @@ a first-generation core-i7 CPU.
 import numpy as np
 
 
-#pythran export dPdZ(float[][], float[][], float[][], float[][], float[][], float, int, int, bool)
-def dPdZ(P_hat, N2, a_g_per_Nt, a_l, g_m_h_v_dv_per_Nt, dz, num_ion_populations, n_channels, add):
-    """Modifies `P_hat` in-place."""
-    out = np.zeros_like(P_hat)
+#pythran export dPdZ(float[][], float[][], float[], float[], float[], int, int, bool)
+def dPdZ(P_hat, N2, a_g_per_Nt_dz, a_l_dz, g_m_h_v_dv_per_Nt_dz, num_ion_populations, n_channels, add):
+    """Modifies `P_hat` in-place. The channel parameters are one value per channel and ion population, premultiplied
+    by the step length dz; the boundary points at both ends don't have ions."""
+    dP = np.zeros_like(P_hat)
     for i in range(num_ion_populations):
         start = i * n_channels
-        for j in range(out.shape[0]):
-            for k in range(out.shape[1]):
-                out[j, k] += P_hat[j, k] * (a_g_per_Nt[start+j, k] * N2[i, k] - a_l[start+j, k]) + (g_m_h_v_dv_per_Nt[start+j, k] * N2[i, k])
+        for j in range(P_hat.shape[0]):
+            for k in range(1, P_hat.shape[1] - 1):
+                dP[j, k] += P_hat[j, k] * (a_g_per_Nt_dz[start+j] * N2[i, k] - a_l_dz[start+j]) \
+                    + g_m_h_v_dv_per_Nt_dz[start+j] * N2[i, k]
     if add:
-        P_hat[:, :] = P_hat + (dz * out)
+        P_hat += dP
     else:
-        P_hat[:, :] = P_hat - (dz * out)
+        P_hat -= dP
 
-#pythran export dNdT(float[][], float[][], float[][], float[][], float, float, int, int)
-def dNdT(N2, P, a_per_h_v_pi_r2, a_g_per_h_v_pi_r2_Nt, A, dt, num_ion_populations, n_channels):
-    """Modifies `N2` in-place."""
-    out = np.empty_like(N2)
+#pythran export dNdT(float[][], float[][], float[], float[], float, int, int)
+def dNdT(N2, P, a_per_h_v_pi_r2_dt, a_g_per_h_v_pi_r2_Nt_dt, A_dt, num_ion_populations, n_channels):
+    """Modifies `N2` in-place. The channel parameters and the decay rate `A_dt` are premultiplied by the time step dt;
+    the boundary points at both ends don't have ions."""
     for i in range(num_ion_populations):
         start = i * n_channels
-        tmp = np.zeros(out.shape[1], dtype=out.dtype)
-        for k in range(out.shape[1]):
-            for j in range(n_channels):
-                tmp[k] += P[j, k] * (a_per_h_v_pi_r2[start+j, k] - a_g_per_h_v_pi_r2_Nt[start+j, k] * N2[i, k])
-            out[i, k] = tmp[k] - A * N2[i, k]
-    N2[:, :] = N2 + (dt * out)
+        for k in range(N2.shape[1]):
+            dN2 = -A_dt * N2[i, k]
+            if 0 < k < N2.shape[1] - 1:
+                for j in range(n_channels):
+                    dN2 += P[j, k] * (a_per_h_v_pi_r2_dt[start+j] - a_g_per_h_v_pi_r2_Nt_dt[start+j] * N2[i, k])
+            N2[i, k] += dN2
 
 #pythran export shift_against_propagation_direction_to_from(float[][], float[][], int)
 def shift_against_propagation_direction_to_from(P_hat_backward, P_hat_forward, n_forward):
@@ -0,0 +1,113 @@
+"""
+Time stepping kernel of the numba backend. The module only depends on numba and pyfiberamp.parameters so that
+compile_numba_bindings.py can load it without importing the rest of the package.
+"""
+import hashlib
+
+from numba import njit, prange
+
+from pyfiberamp.parameters import SIMULATION_MIN_POWER
+
+# Identifies the kernel source that an ahead-of-time compiled module was built from.
+with open(__file__, 'rb') as _source_file:
+    KERNEL_SOURCE_HASH = int(hashlib.sha256(_source_file.read()).hexdigest()[:15], 16)
+
+
+# Arguments: P, P_hat_forward, P_hat_backward, N2, P_in_out, source_idx, target_idx, R, a_per_h_v_pi_r2_dt,
+# a_g_per_h_v_pi_r2_Nt_dt, A_dt, a_g_per_Nt_dz, a_l_dz, g_m_h_v_dv_per_Nt_dz, n_forward, num_ion_populations,
+# n_channels, start_iteration, stop_iteration
+# The arrays are C-contiguous, which lets numba vectorize the loops over them.
+BFECC_STEPS_SIGNATURE = 'void({0}[:, ::1], {0}[::1], {0}[::1], {0}[:, ::1], f8[:, ::1], i8[::1], i8[::1], f8[::1], ' \
+                        '{0}[::1], {0}[::1], {0}, {0}[::1], {0}[::1], {0}[::1], i8, i8, i8, i8, i8)'
+
+
+@njit(cache=True)
+def apply_input(P, P_in_out, idx_iteration, n_forward):
+    """Same as inner_loop_functions.apply_input. Modifies `P` in-place."""
+    P[:n_forward, 0] = P_in_out[:n_forward, idx_iteration]
+    P[n_forward:, -1] = P_in_out[n_forward:, idx_iteration]
+
+
+@njit(cache=True)
+def apply_reflection(P, source_idx, target_idx, R, n_forward):
+    """Same as inner_loop_functions.apply_reflection. Modifies `P` in-place."""
+    for _source_idx, _target_idx, _R in zip(source_idx, target_idx, R):
+        if _source_idx < n_forward:
+            P[_target_idx, -1] += _R * P[_source_idx, -2]
+        else:
+            P[_target_idx, 0] += _R * P[_source_idx, 1]
+
+
+@njit(cache=True, fastmath=True, inline='always')
+def propagate(P, P_hat_forward, P_hat_backward, N2, j, a_g_per_Nt_dz, a_l_dz, g_m_h_v_dv_per_Nt_dz,
+              num_ion_populations, n_channels):
+    """Makes one BFECC propagation step for channel `j`. `P` and `N2` are ordered along the propagation direction of
+    the channel. Modifies `P` and the scratch arrays `P_hat_forward` and `P_hat_backward` in-place.
+
+    At the first node, the forward estimate is SIMULATION_MIN_POWER, and at the last node the backward estimate is
+    zero, because they are not shifted in from a neighbouring node. The boundary points don't have ions.
+    """
+    nodes = P.shape[0]
+    # Constants in the precision of the arrays to avoid promoting single precision arithmetic
+    min_power = P.dtype.type(SIMULATION_MIN_POWER)
+    half = P.dtype.type(0.5)
+    P_hat_forward[0] = min_power
+    for k in range(1, nodes):
+        P_hat_forward[k] = P[k - 1]
+    for i in range(num_ion_populations):
+        idx = i * n_channels + j
+        for k in range(1, nodes - 1):
+            P_hat_forward[k] += P[k - 1] * (a_g_per_Nt_dz[idx] * N2[i, k] - a_l_dz[idx]) \
+                + g_m_h_v_dv_per_Nt_dz[idx] * N2[i, k]
+    for k in range(nodes):
+        P_hat_forward[k] = max(P_hat_forward[k], min_power)
+    # Shifted only after the whole forward estimate has been clamped.
+    for k in range(nodes - 1):
+        P_hat_backward[k] = P_hat_forward[k + 1]
+    P_hat_backward[nodes - 1] = 0
+    for i in range(num_ion_populations):
+        idx = i * n_channels + j
+        for k in range(1, nodes - 1):
+            P_hat_backward[k] -= P_hat_forward[k + 1] * (a_g_per_Nt_dz[idx] * N2[i, k] - a_l_dz[idx]) \
+                + g_m_h_v_dv_per_Nt_dz[idx] * N2[i, k]
+    for k in range(nodes):
+        P[k] = max(P_hat_forward[k] + half * (P[k] - P_hat_backward[k]), min_power)
+
+
+def bfecc_steps(P, P_hat_forward, P_hat_backward, N2, P_in_out, source_idx, target_idx, R,
+                a_per_h_v_pi_r2_dt, a_g_per_h_v_pi_r2_Nt_dt, A_dt, a_g_per_Nt_dz, a_l_dz, g_m_h_v_dv_per_Nt_dz,
+                n_forward, num_ion_populations, n_channels, start_iteration, stop_iteration):
+    """Advances the simulation from `start_iteration` to `stop_iteration`. Modifies all array arguments except the
+    channel parameters in-place. The channel parameters are premultiplied by the time step dt or the step length dz.
+    The arrays and channel parameters can be either single or double precision.
+
+    Each time step makes one pass over the excitation and one over the powers. The excitation of each z node depends
+    only on the local powers, so the rate equation is solved for all nodes in parallel. The propagation step is done
+    channel by channel so that the intermediate BFECC estimates stay in cache, and runs serially.
+
+    Left undecorated: dynamic_solver_numba jit compiles it in parallel and compile_numba_bindings compiles it ahead of
+    time.
+    """
+    nodes = P.shape[1]
+    min_excitation = N2.dtype.type(SIMULATION_MIN_POWER)
+    N2_backward = N2[:, ::-1]
+    for idx_iteration in range(start_iteration, stop_iteration):
+        apply_input(P, P_in_out, idx_iteration, n_forward)
+        apply_reflection(P, source_idx, target_idx, R, n_forward)
+        for k in prange(nodes):
+            for i in range(num_ion_populations):
+                start = i * n_channels
+                dN2 = -A_dt * N2[i, k]
+                if 0 < k < nodes - 1:
+                    for j in range(n_channels):
+                        dN2 += P[j, k] * (a_per_h_v_pi_r2_dt[start+j] - a_g_per_h_v_pi_r2_Nt_dt[start+j] * N2[i, k])
+                N2[i, k] = max(N2[i, k] + dN2, min_excitation)
+        for j in range(n_channels):
+            if j < n_forward:
+                P_in_out[j, idx_iteration] = P[j, -2]
+                propagate(P[j, :], P_hat_forward, P_hat_backward, N2, j,
+                          a_g_per_Nt_dz, a_l_dz, g_m_h_v_dv_per_Nt_dz, num_ion_populations, n_channels)
+            else:
+                P_in_out[j, idx_iteration] = P[j, 1]
+                propagate(P[j, ::-1], P_hat_forward, P_hat_backward, N2_backward, j,
+                          a_g_per_Nt_dz, a_l_dz, g_m_h_v_dv_per_Nt_dz, num_ion_populations, n_channels)
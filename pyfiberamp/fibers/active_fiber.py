@@ -71,13 +71,13 @@ class ActiveFiber(FiberBase):
         return zeta_from_fiber_parameters(self.core_radius, self.spectroscopy.upper_state_lifetime, self.ion_number_density)
 
     def get_channel_emission_cross_section(self, freq, frequency_bandwidth):
-        if frequency_bandwidth == 0:
+        if np.all(frequency_bandwidth == 0):
             return self.spectroscopy.gain_cs_interp(freq)
         else:
             return averaged_value_of_finite_bandwidth_spectrum(freq, frequency_bandwidth, self.spectroscopy.gain_cs_interp)
 
     def get_channel_absorption_cross_section(self, freq, frequency_bandwidth):
-        if frequency_bandwidth == 0:
+        if np.all(frequency_bandwidth == 0):
             return self.spectroscopy.absorption_cs_interp(freq)
         else:
             return averaged_value_of_finite_bandwidth_spectrum(freq, frequency_bandwidth, self.spectroscopy.absorption_cs_interp)
@@ -1,4 +1,5 @@
 from abc import ABC, abstractmethod
+from copy import copy, deepcopy
 
 from pyfiberamp.doping_profile import DopingProfile
 from pyfiberamp.helper_funcs import *
@@ -38,6 +39,20 @@ class FiberBase(ABC):
                                                      'mode_diameter': 0,
                                                      'overlaps': []}
 
+    def clone(self):
+        """Returns a copy of the fiber that can be modified independently of the original, e.g. by setting a new
+        doping profile. Faster than copy.deepcopy because the read-only spectroscopic data is shared, not copied.
+
+        :returns: Copy of the fiber
+        :rtype: Same as the fiber
+
+        """
+        fiber = copy(self)
+        fiber.doping_profile = deepcopy(self.doping_profile)
+        fiber.default_signal_mode_shape_parameters = deepcopy(self.default_signal_mode_shape_parameters)
+        fiber.default_pump_mode_shape_parameters = deepcopy(self.default_pump_mode_shape_parameters)
+        return fiber
+
     def v_parameter(self, wl):
         return fiber_v_parameter(wl, self.core_radius, self.core_na)
 
@@ -266,10 +266,11 @@ def dynamic_time_coordinates(max_time_steps, z_nodes, fiber_length, dt='auto'):
 
 
 def averaged_value_of_finite_bandwidth_spectrum(center_frequency, frequency_bandwidth, spectrum_func):
-    """Function used to calculate the average gain or absorption cross section of a finite bandwidth channel."""
+    """Function used to calculate the average gain or absorption cross section of a finite bandwidth channel. Also
+    accepts arrays of center frequencies and bandwidths to evaluate many channels at once."""
     start_frequency = center_frequency - frequency_bandwidth / 2
     end_frequency = center_frequency + frequency_bandwidth / 2
     start_value = spectrum_func(start_frequency)
     middle_value = spectrum_func(center_frequency)
     end_value = spectrum_func(end_frequency)
-    return np.mean([start_value, middle_value, end_value])
\ No newline at end of file
+    return np.mean([start_value, middle_value, end_value], axis=0)
\ No newline at end of file
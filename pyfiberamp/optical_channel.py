@@ -53,17 +53,48 @@ class OpticalChannel:
             return default_parameters
         return {**default_parameters, **input_parameters}
 
+    @classmethod
+    def create_ase_channels(cls, fiber, wls, wl_bandwidth):
+        """Creates the forward and backward ASE channels of the wavelength bins wls. The cross sections of all bins
+        are interpolated at once, and the overlaps and cross sections of each bin are shared by both directions."""
+        mode_shape_parameters = fiber.default_signal_mode_shape_parameters
+        center_frequencies = wl_to_freq(wls)
+        frequency_bandwidths = wl_bw_to_freq_bw(wl_bandwidth, wls)
+        emission_cs = np.broadcast_to(
+            fiber.get_channel_emission_cross_section(center_frequencies, frequency_bandwidths), wls.shape)
+        absorption_cs = np.broadcast_to(
+            fiber.get_channel_absorption_cross_section(center_frequencies, frequency_bandwidths), wls.shape)
+        forward_channels, backward_channels = [], []
+        for wl, v, dv, g_cs, a_cs in zip(wls, center_frequencies, frequency_bandwidths, emission_cs, absorption_cs):
+            overlaps, mode_func = cls.get_overlaps_and_mode_func(fiber, wl, mode_shape_parameters)
+            forward_channels.append(cls._channel_from_cross_sections(fiber, v, dv, SIMULATION_MIN_POWER, 1, overlaps,
+                                                                     mode_func, g_cs, a_cs, '', '', 0, 'forward_ase'))
+            backward_channels.append(cls._channel_from_cross_sections(fiber, v, dv, SIMULATION_MIN_POWER, -1,
+                                                                      overlaps, mode_func, g_cs, a_cs, '', '', 0,
+                                                                      'backward_ase'))
+        return forward_channels, backward_channels
+
     @classmethod
     def _create_channel(cls, fiber, wl, wl_bandwidth, power, mode_shape_parameters,
                         direction, label, reflection_target_label,
                         reflection_coeff, channel_type):
 
-        n_ion_populations = fiber.num_ion_populations
         overlaps, mode_func = cls.get_overlaps_and_mode_func(fiber, wl, mode_shape_parameters)
         center_frequency = wl_to_freq(wl)
         frequency_bandwidth = wl_bw_to_freq_bw(wl_bandwidth, wl)
-        gain = overlaps * fiber.get_channel_emission_cross_section(center_frequency, frequency_bandwidth) * fiber.doping_profile.ion_number_densities
-        absorption = overlaps * fiber.get_channel_absorption_cross_section(center_frequency, frequency_bandwidth) * fiber.doping_profile.ion_number_densities
+        emission_cs = fiber.get_channel_emission_cross_section(center_frequency, frequency_bandwidth)
+        absorption_cs = fiber.get_channel_absorption_cross_section(center_frequency, frequency_bandwidth)
+        return cls._channel_from_cross_sections(fiber, center_frequency, frequency_bandwidth, power, direction,
+                                                overlaps, mode_func, emission_cs, absorption_cs, label,
+                                                reflection_target_label, reflection_coeff, channel_type)
+
+    @staticmethod
+    def _channel_from_cross_sections(fiber, center_frequency, frequency_bandwidth, power, direction, overlaps,
+                                     mode_func, emission_cs, absorption_cs, label, reflection_target_label,
+                                     reflection_coeff, channel_type):
+        n_ion_populations = fiber.num_ion_populations
+        gain = overlaps * emission_cs * fiber.doping_profile.ion_number_densities
+        absorption = overlaps * absorption_cs * fiber.doping_profile.ion_number_densities
         center_frequency = np.full(n_ion_populations, center_frequency)
         frequency_bandwidth = np.full(n_ion_populations, frequency_bandwidth)
         loss = np.full(n_ion_populations, fiber.background_loss)
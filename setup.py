@@ -1,3 +1,6 @@
+import importlib.util
+import os
+
 from setuptools import setup, dist
 try:
     # Try to compile pythran binary extension module.
@@ -13,6 +16,17 @@ try:
 except ImportError:
     ext_modules = []
     cmdclass = {}
+if os.environ.get('PYFIBERAMP_NUMBA_AOT') == '1':
+    try:
+        # Try to compile the numba backend's kernel ahead of time. The build script is loaded from its file so that the
+        # package and its dependencies are not imported.
+        spec = importlib.util.spec_from_file_location('pyfiberamp.dynamic.compile_numba_bindings',
+                                                      'pyfiberamp/dynamic/compile_numba_bindings.py')
+        compile_numba_bindings = importlib.util.module_from_spec(spec)
+        spec.loader.exec_module(compile_numba_bindings)
+        ext_modules.append(compile_numba_bindings.cc.distutils_extension())
+    except Exception as e:
+        print('The numba kernel is not compiled ahead of time: {}'.format(e))
 
 VERSION = '0.4.0'
 
@@ -1,6 +1,7 @@
 import numpy as np
-from copy import deepcopy
+from scipy.integrate import solve_ivp
 import unittest
+from unittest import mock
 
 from pyfiberamp.fibers import YbDopedFiber
 from pyfiberamp.dynamic import DynamicSimulation
@@ -20,12 +21,26 @@ class DynamicSimulationTest(unittest.TestCase):
         cls.time_steps = 50000
         cls.z_nodes = 150
         cls.steady_state_dt = 1e-5
+        cls.steady_state_tolerance = 1e-4
+        cls.warm_up_backends()
+
+    @classmethod
+    def warm_up_backends(cls):
+        """Runs a tiny simulation with every backend so that jit compilation (or loading the compiled code from the
+        cache) happens once instead of in every test."""
+        dynamic_simulation = DynamicSimulation(10)
+        dynamic_simulation.fiber = cls.fiber
+        dynamic_simulation.add_forward_signal(wl=cls.signal_wl, input_power=cls.signal_power)
+        dynamic_simulation.add_backward_pump(wl=cls.pump_wl, input_power=cls.pump_power)
+        for backend in dynamic_simulation.backends:
+            getattr(dynamic_simulation, 'use_{}_backend'.format(backend))()
+            dynamic_simulation.run(z_nodes=4, dt=cls.steady_state_dt)
 
     def test_available_backends(self):
         dynamic_simulation = DynamicSimulation(self.time_steps)
         print('Tested dynamic backends: {}'.format(dynamic_simulation.backends))
 
-    def test_steady_state_python_and_cpp_single_ring(self):
+    def test_backend_equivalence(self):
         steady_state_simulation = SteadyStateSimulation()
         steady_state_simulation.fiber = self.fiber
         steady_state_simulation.add_cw_signal(wl=self.signal_wl, power=self.signal_power)
@@ -41,31 +56,189 @@ class DynamicSimulationTest(unittest.TestCase):
         dynamic_simulation.add_forward_pump(wl=self.pump_wl, input_power=self.pump_power/2)
         dynamic_simulation.add_ase(wl_start=1020e-9, wl_end=1040e-9, n_bins=3)
 
+        # Starting from the steady state solution, the excitation converges within two checking intervals.
+        forward_slice, backward_slice = steady_state_result.channels.get_forward_and_backward_slices()
+        dynamic_simulation.set_initial_state(N2=steady_state_result.upper_level_fraction * self.nt,
+                                             forward_powers=steady_state_result.powers[forward_slice, :],
+                                             backward_powers=steady_state_result.powers[backward_slice, :],
+                                             z=steady_state_result.z)
+        convergence_checking_interval = 1000
+
         dynamic_simulation.use_cpp_backend()
-        cpp_result = dynamic_simulation.run(z_nodes=self.z_nodes, dt=self.steady_state_dt, stop_at_steady_state=True)
+        cpp_result = dynamic_simulation.run(z_nodes=self.z_nodes, dt=self.steady_state_dt, stop_at_steady_state=True,
+                                            steady_state_tolerance=self.steady_state_tolerance,
+                                            convergence_checking_interval=convergence_checking_interval)
 
         dynamic_simulation.use_python_backend()
-        python_result = dynamic_simulation.run(z_nodes=self.z_nodes, dt=self.steady_state_dt, stop_at_steady_state=True)
+        python_result = dynamic_simulation.run(z_nodes=self.z_nodes, dt=self.steady_state_dt, stop_at_steady_state=True,
+                                               steady_state_tolerance=self.steady_state_tolerance,
+                                               convergence_checking_interval=convergence_checking_interval)
 
         dynamic_simulation.use_pythran_backend()
-        pythran_result = dynamic_simulation.run(z_nodes=self.z_nodes, dt=self.steady_state_dt, stop_at_steady_state=True)
+        pythran_result = dynamic_simulation.run(z_nodes=self.z_nodes, dt=self.steady_state_dt, stop_at_steady_state=True,
+                                                steady_state_tolerance=self.steady_state_tolerance,
+                                                convergence_checking_interval=convergence_checking_interval)
 
         dynamic_simulation.use_numba_backend()
-        numba_result = dynamic_simulation.run(z_nodes=self.z_nodes, dt=self.steady_state_dt, stop_at_steady_state=True)
+        numba_result = dynamic_simulation.run(z_nodes=self.z_nodes, dt=self.steady_state_dt, stop_at_steady_state=True,
+                                              steady_state_tolerance=self.steady_state_tolerance,
+                                              convergence_checking_interval=convergence_checking_interval)
 
         steady_state_output_powers = steady_state_result.powers_at_fiber_end()
         cpp_output_powers = cpp_result.powers_at_fiber_end()
         python_output_powers = python_result.powers_at_fiber_end()
         pythran_output_powers = pythran_result.powers_at_fiber_end()
         numba_output_powers = numba_result.powers_at_fiber_end()
-        self.assertTrue(np.allclose(steady_state_output_powers, cpp_output_powers, rtol=1e-3))
-        self.assertTrue(np.allclose(cpp_output_powers, python_output_powers, rtol=1e-6))
-        self.assertTrue(np.allclose(pythran_output_powers, python_output_powers, rtol=1e-6))
-        self.assertTrue(np.allclose(numba_output_powers, python_output_powers, rtol=1e-6))
+        np.testing.assert_allclose(steady_state_output_powers, cpp_output_powers, rtol=1e-3, atol=1e-8)
+        np.testing.assert_allclose(cpp_output_powers, python_output_powers, rtol=1e-6, atol=1e-8)
+        np.testing.assert_allclose(pythran_output_powers, python_output_powers, rtol=1e-6, atol=1e-8)
+        np.testing.assert_allclose(numba_output_powers, python_output_powers, rtol=1e-6, atol=1e-8)
+
+        # The stiff backend stops right away because the initial state is already steady.
+        dynamic_simulation.use_stiff_backend()
+        stiff_result = dynamic_simulation.run(z_nodes=self.z_nodes, dt=self.steady_state_dt, stop_at_steady_state=True,
+                                              steady_state_tolerance=self.steady_state_tolerance)
+        np.testing.assert_allclose(steady_state_output_powers, stiff_result.powers_at_fiber_end(), rtol=1e-4,
+                                   atol=1e-8)
+        self.assertEqual(len(stiff_result.t), 1)
+
+    def test_initial_state_validation_and_clearing(self):
+        def simulation():
+            dynamic_simulation = DynamicSimulation(10)
+            dynamic_simulation.fiber = self.fiber
+            dynamic_simulation.add_forward_signal(wl=self.signal_wl, input_power=self.signal_power)
+            dynamic_simulation.add_backward_pump(wl=self.pump_wl, input_power=self.pump_power)
+            dynamic_simulation.use_python_backend()
+            return dynamic_simulation
+
+        dynamic_simulation = simulation()
+        N2 = np.full((1, self.z_nodes), self.nt / 2)
+        powers = np.full((1, self.z_nodes), self.signal_power)
+        with self.assertRaises(AssertionError):
+            dynamic_simulation.set_initial_state(N2=N2, forward_powers=np.vstack((powers, powers)),
+                                                 backward_powers=powers)
+        dynamic_simulation.set_initial_state(N2=N2, forward_powers=powers, backward_powers=powers)
+        dynamic_simulation.clear_initial_state()
+
+        cleared_result = dynamic_simulation.run(z_nodes=self.z_nodes, dt=self.steady_state_dt)
+        fresh_result = simulation().run(z_nodes=self.z_nodes, dt=self.steady_state_dt)
+        np.testing.assert_array_equal(cleared_result.output_powers, fresh_result.output_powers)
+
+    def test_transient_backend_equivalence(self):
+        # Starts from the default initial state so that the compiled kernels are checked against the Python backend
+        # during the transient as well.
+        dynamic_simulation = DynamicSimulation(2000)
+        dynamic_simulation.fiber = self.fiber
+        dynamic_simulation.add_forward_signal(wl=self.signal_wl, input_power=self.signal_power)
+        dynamic_simulation.add_backward_pump(wl=self.pump_wl, input_power=self.pump_power/2)
+        dynamic_simulation.add_forward_pump(wl=self.pump_wl, input_power=self.pump_power/2)
+        dynamic_simulation.add_ase(wl_start=1020e-9, wl_end=1040e-9, n_bins=3)
+
+        dynamic_simulation.use_python_backend()
+        python_result = dynamic_simulation.run(z_nodes=self.z_nodes, dt=self.steady_state_dt)
+
+        dynamic_simulation.use_cpp_backend()
+        cpp_result = dynamic_simulation.run(z_nodes=self.z_nodes, dt=self.steady_state_dt)
+
+        dynamic_simulation.use_pythran_backend()
+        pythran_result = dynamic_simulation.run(z_nodes=self.z_nodes, dt=self.steady_state_dt)
+
+        dynamic_simulation.use_numba_backend()
+        numba_result = dynamic_simulation.run(z_nodes=self.z_nodes, dt=self.steady_state_dt)
+
+        np.testing.assert_allclose(cpp_result.output_powers, python_result.output_powers, rtol=1e-6)
+        np.testing.assert_allclose(pythran_result.output_powers, python_result.output_powers, rtol=1e-6)
+        np.testing.assert_allclose(numba_result.output_powers, python_result.output_powers, rtol=1e-6)
+
+    def test_steady_state_stiff(self):
+        steady_state_simulation = SteadyStateSimulation()
+        steady_state_simulation.fiber = self.fiber
+        steady_state_simulation.add_cw_signal(wl=self.signal_wl, power=self.signal_power)
+        steady_state_simulation.add_backward_pump(wl=self.pump_wl, power=self.pump_power/2)
+        steady_state_simulation.add_forward_pump(wl=self.pump_wl, power=self.pump_power/2)
+        steady_state_simulation.add_ase(wl_start=1020e-9, wl_end=1040e-9, n_bins=3)
+        steady_state_result = steady_state_simulation.run(tol=1e-5)
 
-    def test_steady_state_python_and_cpp_two_rings(self):
         dynamic_simulation = DynamicSimulation(self.time_steps)
-        fiber_with_rings = deepcopy(self.fiber)
+        dynamic_simulation.fiber = self.fiber
+        dynamic_simulation.add_forward_signal(wl=self.signal_wl, input_power=self.signal_power)
+        dynamic_simulation.add_backward_pump(wl=self.pump_wl, input_power=self.pump_power/2)
+        dynamic_simulation.add_forward_pump(wl=self.pump_wl, input_power=self.pump_power/2)
+        dynamic_simulation.add_ase(wl_start=1020e-9, wl_end=1040e-9, n_bins=3)
+
+        dynamic_simulation.use_stiff_backend()
+        stiff_result = dynamic_simulation.run(z_nodes=self.z_nodes, dt=self.steady_state_dt, stop_at_steady_state=True,
+                                              steady_state_tolerance=self.steady_state_tolerance)
+
+        steady_state_output_powers = steady_state_result.powers_at_fiber_end()
+        stiff_output_powers = stiff_result.powers_at_fiber_end()
+        np.testing.assert_allclose(steady_state_output_powers, stiff_output_powers, rtol=1e-4, atol=1e-8)
+        self.assertLess(len(stiff_result.t), 1000)
+
+    def test_stiff_failure_is_logged(self):
+        dynamic_simulation = DynamicSimulation(self.time_steps)
+        dynamic_simulation.fiber = self.fiber
+        dynamic_simulation.add_forward_signal(wl=self.signal_wl, input_power=self.signal_power)
+        dynamic_simulation.add_backward_pump(wl=self.pump_wl, input_power=self.pump_power)
+        dynamic_simulation.use_stiff_backend()
+
+        def failing_solve_ivp(*args, **kwargs):
+            sol = solve_ivp(*args, **kwargs)
+            sol.success = False
+            sol.message = 'Forced failure.'
+            return sol
+
+        with mock.patch('pyfiberamp.dynamic.dynamic_solver_stiff.solve_ivp', failing_solve_ivp), \
+                self.assertLogs(level='WARNING') as logs:
+            dynamic_simulation.run(z_nodes=self.z_nodes, dt=self.steady_state_dt, stop_at_steady_state=True,
+                                   steady_state_tolerance=self.steady_state_tolerance)
+        self.assertIn('Forced failure.', logs.output[0])
+
+    def test_steady_state_single_precision(self):
+        steady_state_simulation = SteadyStateSimulation()
+        steady_state_simulation.fiber = self.fiber
+        steady_state_simulation.add_cw_signal(wl=self.signal_wl, power=self.signal_power)
+        steady_state_simulation.add_backward_pump(wl=self.pump_wl, power=self.pump_power/2)
+        steady_state_simulation.add_forward_pump(wl=self.pump_wl, power=self.pump_power/2)
+        steady_state_simulation.add_ase(wl_start=1020e-9, wl_end=1040e-9, n_bins=3)
+        steady_state_result = steady_state_simulation.run(tol=1e-5)
+
+        dynamic_simulation = DynamicSimulation(self.time_steps)
+        dynamic_simulation.fiber = self.fiber
+        dynamic_simulation.add_forward_signal(wl=self.signal_wl, input_power=self.signal_power)
+        dynamic_simulation.add_backward_pump(wl=self.pump_wl, input_power=self.pump_power/2)
+        dynamic_simulation.add_forward_pump(wl=self.pump_wl, input_power=self.pump_power/2)
+        dynamic_simulation.add_ase(wl_start=1020e-9, wl_end=1040e-9, n_bins=3)
+
+        if 'numba' not in dynamic_simulation.backends:
+            self.skipTest('Single precision requires the numba backend.')
+        from pyfiberamp.dynamic.dynamic_solver_numba import DynamicSolverNumba
+        dynamic_simulation.use_numba_backend()
+
+        # Records the precision of each stage of the simulation.
+        steps_until_converged = DynamicSolverNumba._bfecc_steps_until_converged
+        stage_dtypes = []
+
+        def recording_steps_until_converged(P, *args):
+            stage_dtypes.append(P.dtype)
+            return steps_until_converged(P, *args)
+
+        with mock.patch.object(DynamicSolverNumba, '_bfecc_steps_until_converged',
+                               staticmethod(recording_steps_until_converged)):
+            single_precision_result = dynamic_simulation.run(z_nodes=self.z_nodes, dt=self.steady_state_dt,
+                                                             stop_at_steady_state=True,
+                                                             steady_state_tolerance=self.steady_state_tolerance,
+                                                             dtype=np.float32)
+
+        steady_state_output_powers = steady_state_result.powers_at_fiber_end()
+        single_precision_output_powers = single_precision_result.powers_at_fiber_end()
+        np.testing.assert_allclose(steady_state_output_powers, single_precision_output_powers, rtol=1e-3, atol=1e-8)
+        self.assertEqual(stage_dtypes, [np.float32, np.float64])
+        self.assertEqual(single_precision_result.powers.dtype, np.float64)
+
+    def test_steady_state_two_rings(self):
+        dynamic_simulation = DynamicSimulation(self.time_steps)
+        fiber_with_rings = self.fiber.clone()
         fiber_with_rings.set_doping_profile(ion_number_densities=[self.nt, self.nt],
                                             radii=[self.fiber.core_radius/2, self.fiber.core_radius])
         dynamic_simulation.fiber = fiber_with_rings
@@ -75,33 +248,55 @@ class DynamicSimulationTest(unittest.TestCase):
         dynamic_simulation.add_ase(wl_start=1020e-9, wl_end=1040e-9, n_bins=3)
 
         dynamic_simulation.use_cpp_backend()
-        cpp_result = dynamic_simulation.run(z_nodes=self.z_nodes, dt=self.steady_state_dt, stop_at_steady_state=True)
-
-        dynamic_simulation.use_python_backend()
-        python_result = dynamic_simulation.run(z_nodes=self.z_nodes, dt=self.steady_state_dt, stop_at_steady_state=True)
+        cpp_result = dynamic_simulation.run(z_nodes=self.z_nodes, dt=self.steady_state_dt, stop_at_steady_state=True,
+                                            steady_state_tolerance=self.steady_state_tolerance)
 
         dynamic_simulation.use_pythran_backend()
-        pythran_result = dynamic_simulation.run(z_nodes=self.z_nodes, dt=self.steady_state_dt, stop_at_steady_state=True)
+        pythran_result = dynamic_simulation.run(z_nodes=self.z_nodes, dt=self.steady_state_dt, stop_at_steady_state=True,
+                                                steady_state_tolerance=self.steady_state_tolerance)
 
         dynamic_simulation.use_numba_backend()
-        numba_result = dynamic_simulation.run(z_nodes=self.z_nodes, dt=self.steady_state_dt, stop_at_steady_state=True)
+        numba_result = dynamic_simulation.run(z_nodes=self.z_nodes, dt=self.steady_state_dt, stop_at_steady_state=True,
+                                              steady_state_tolerance=self.steady_state_tolerance)
 
         cpp_output_powers = cpp_result.powers_at_fiber_end()
-        python_output_powers = python_result.powers_at_fiber_end()
         pythran_output_powers = pythran_result.powers_at_fiber_end()
         numba_output_powers = numba_result.powers_at_fiber_end()
 
         expected_output_regression = np.array([1.24777656e-01, 3.00423131e-01, 2.20330515e-07,
                                                2.32158298e-07, 1.80295869e-07, 3.01233048e-01,
                                                2.42165526e-07, 2.52453304e-07, 1.91762386e-07])
-        self.assertTrue(np.allclose(cpp_output_powers, python_output_powers, rtol=1e-6))
-        self.assertTrue(np.allclose(cpp_output_powers, expected_output_regression, rtol=1e-6))
-        self.assertTrue(np.allclose(pythran_output_powers, expected_output_regression, rtol=1e-6))
-        self.assertTrue(np.allclose(numba_output_powers, expected_output_regression, rtol=1e-6))
+        np.testing.assert_allclose(cpp_output_powers, expected_output_regression, rtol=1e-6, atol=1e-8)
+        np.testing.assert_allclose(pythran_output_powers, expected_output_regression, rtol=1e-6, atol=1e-8)
+        np.testing.assert_allclose(numba_output_powers, expected_output_regression, rtol=1e-6, atol=1e-8)
+
+    def test_adaptive_dt_two_rings(self):
+        dynamic_simulation = DynamicSimulation(self.time_steps)
+        fiber_with_rings = self.fiber.clone()
+        fiber_with_rings.set_doping_profile(ion_number_densities=[self.nt, self.nt],
+                                            radii=[self.fiber.core_radius/2, self.fiber.core_radius])
+        dynamic_simulation.fiber = fiber_with_rings
+        dynamic_simulation.add_forward_signal(wl=self.signal_wl, input_power=self.signal_power)
+        dynamic_simulation.add_backward_pump(wl=self.pump_wl, input_power=self.pump_power / 2)
+        dynamic_simulation.add_forward_pump(wl=self.pump_wl, input_power=self.pump_power / 2)
+
+        # The fixed time step is too long for the explicit excitation update in the inner ring; the adaptive time
+        # step is limited to the stable range.
+        dynamic_simulation.use_python_backend()
+        python_result = dynamic_simulation.run(z_nodes=self.z_nodes, dt=self.steady_state_dt, stop_at_steady_state=True,
+                                               steady_state_tolerance=self.steady_state_tolerance,
+                                               convergence_checking_interval=1000, adaptive_dt=True)
+
+        dynamic_simulation.use_stiff_backend()
+        stiff_result = dynamic_simulation.run(z_nodes=self.z_nodes, dt=self.steady_state_dt, stop_at_steady_state=True,
+                                              steady_state_tolerance=self.steady_state_tolerance)
+
+        np.testing.assert_allclose(python_result.powers_at_fiber_end(), stiff_result.powers_at_fiber_end(), rtol=1e-3)
+        self.assertTrue(np.all(python_result.upper_level_fraction <= 1))
 
-    def test_steady_state_python_and_cpp_preset_areas_and_overlaps(self):
+    def test_steady_state_preset_areas_and_overlaps(self):
         dynamic_simulation = DynamicSimulation(self.time_steps)
-        fiber_with_rings = deepcopy(self.fiber)
+        fiber_with_rings = self.fiber.clone()
         r = self.fiber.core_radius
         areas = np.pi * (np.array([r/2, r])**2 - np.array([0, r/2])**2)
         overlaps = [0.5, 0.2]
@@ -120,31 +315,27 @@ class DynamicSimulationTest(unittest.TestCase):
         dynamic_simulation.use_cpp_backend()
         cpp_result = dynamic_simulation.run(z_nodes=self.z_nodes,
                                             dt=self.steady_state_dt/10,
-                                            stop_at_steady_state=True)
-
-        dynamic_simulation.use_python_backend()
-        python_result = dynamic_simulation.run(z_nodes=self.z_nodes,
-                                               dt=self.steady_state_dt/10,
-                                               stop_at_steady_state=True)
+                                            stop_at_steady_state=True,
+                                            steady_state_tolerance=self.steady_state_tolerance)
 
         dynamic_simulation.use_pythran_backend()
         pythran_result = dynamic_simulation.run(z_nodes=self.z_nodes,
                                                dt=self.steady_state_dt/10,
-                                               stop_at_steady_state=True)
+                                               stop_at_steady_state=True,
+                                               steady_state_tolerance=self.steady_state_tolerance)
         dynamic_simulation.use_numba_backend()
         numba_result = dynamic_simulation.run(z_nodes=self.z_nodes,
                                                dt=self.steady_state_dt/10,
-                                               stop_at_steady_state=True)
+                                               stop_at_steady_state=True,
+                                               steady_state_tolerance=self.steady_state_tolerance)
 
         expected_output_regression = np.array([0.1166232, 0.23989275, 0.23988858])
         cpp_output_powers = cpp_result.powers_at_fiber_end()
-        python_output_powers = python_result.powers_at_fiber_end()
         pythran_output_powers = pythran_result.powers_at_fiber_end()
         numba_output_powers = numba_result.powers_at_fiber_end()
-        self.assertTrue(np.allclose(cpp_output_powers, python_output_powers, rtol=1e-6))
-        self.assertTrue(np.allclose(cpp_output_powers, expected_output_regression, rtol=1e-6))
-        self.assertTrue(np.allclose(pythran_output_powers, expected_output_regression, rtol=1e-6))
-        self.assertTrue(np.allclose(numba_output_powers, expected_output_regression, rtol=1e-6))
+        np.testing.assert_allclose(cpp_output_powers, expected_output_regression, rtol=1e-6, atol=1e-8)
+        np.testing.assert_allclose(pythran_output_powers, expected_output_regression, rtol=1e-6, atol=1e-8)
+        np.testing.assert_allclose(numba_output_powers, expected_output_regression, rtol=1e-6, atol=1e-8)
 
     def test_steady_state_reflection(self):
         dynamic_simulation = DynamicSimulation(self.time_steps)
@@ -163,29 +354,53 @@ class DynamicSimulationTest(unittest.TestCase):
         dynamic_simulation.use_cpp_backend()
         cpp_res = dynamic_simulation.run(z_nodes=self.z_nodes,
                                          dt=self.steady_state_dt,
-                                         stop_at_steady_state=True)
-
-        dynamic_simulation.use_python_backend()
-        python_res = dynamic_simulation.run(z_nodes=self.z_nodes,
-                                            dt=self.steady_state_dt,
-                                            stop_at_steady_state=True)
+                                         stop_at_steady_state=True,
+                                         steady_state_tolerance=self.steady_state_tolerance)
 
         dynamic_simulation.use_pythran_backend()
         pythran_res = dynamic_simulation.run(z_nodes=self.z_nodes,
                                          dt=self.steady_state_dt,
-                                         stop_at_steady_state=True)
+                                         stop_at_steady_state=True,
+                                         steady_state_tolerance=self.steady_state_tolerance)
 
         dynamic_simulation.use_numba_backend()
         numba_res = dynamic_simulation.run(z_nodes=self.z_nodes,
                                             dt=self.steady_state_dt,
-                                            stop_at_steady_state=True)
+                                            stop_at_steady_state=True,
+                                            steady_state_tolerance=self.steady_state_tolerance)
 
         cpp_output = cpp_res.powers_at_fiber_end()
-        python_output = python_res.powers_at_fiber_end()
         pythran_output = pythran_res.powers_at_fiber_end()
         numba_output = numba_res.powers_at_fiber_end()
         expected_output = np.array([0.11878692, 0.00564412, 0.47651562])
-        self.assertTrue(np.allclose(cpp_output, python_output, rtol=1e-6))
-        self.assertTrue(np.allclose(cpp_output, expected_output, rtol=1e-6))
-        self.assertTrue(np.allclose(pythran_output, expected_output, rtol=1e-6))
-        self.assertTrue(np.allclose(numba_output, expected_output, rtol=1e-6))
+        np.testing.assert_allclose(cpp_output, expected_output, rtol=1e-6, atol=1e-8)
+        np.testing.assert_allclose(pythran_output, expected_output, rtol=1e-6, atol=1e-8)
+        np.testing.assert_allclose(numba_output, expected_output, rtol=1e-6, atol=1e-8)
+
+    def test_clamped_powers_backend_equivalence(self):
+        # Strong absorption of the weak 976 nm signals in a long, heavily doped fiber drives the propagated powers to
+        # the lower clamping limit.
+        dynamic_simulation = DynamicSimulation(3000)
+        dynamic_simulation.fiber = YbDopedFiber(length=3, core_radius=self.fiber.core_radius, core_na=0.12,
+                                                ion_number_density=1e26)
+        dynamic_simulation.add_forward_signal(wl=976e-9, input_power=1e-13)
+        dynamic_simulation.add_backward_signal(wl=976e-9, input_power=1e-13)
+        dynamic_simulation.add_forward_pump(wl=1030e-9, input_power=1e-3)
+
+        dynamic_simulation.use_python_backend()
+        python_result = dynamic_simulation.run(z_nodes=50, dt=1e-6)
+
+        dynamic_simulation.use_cpp_backend()
+        cpp_result = dynamic_simulation.run(z_nodes=50, dt=1e-6)
+
+        dynamic_simulation.use_pythran_backend()
+        pythran_result = dynamic_simulation.run(z_nodes=50, dt=1e-6)
+
+        dynamic_simulation.use_numba_backend()
+        numba_result = dynamic_simulation.run(z_nodes=50, dt=1e-6)
+
+        python_output_powers = python_result.powers_at_fiber_end()
+        self.assertTrue(np.all(np.isfinite(python_output_powers)))
+        np.testing.assert_allclose(cpp_result.powers_at_fiber_end(), python_output_powers, rtol=1e-6)
+        np.testing.assert_allclose(pythran_result.powers_at_fiber_end(), python_output_powers, rtol=1e-6)
+        np.testing.assert_allclose(numba_result.powers_at_fiber_end(), python_output_powers, rtol=1e-6)